@@ -12,7 +12,7 @@ import logging
 import argparse
 import tempfile
 import configparser
-from PIL import Image, ImageFile
+from PIL import Image, ImageFile, features
 
 # Constants
 CONFIG_FILE = "artwork-config.ini"
@@ -46,6 +46,14 @@ def load_config():
     config.read(CONFIG_FILE)
     return config.get("paths", "rootmusicdir", fallback=None)
 
+def log_jpeg_backend():
+    """Log Pillow's JPEG codec, warning if it isn't libjpeg-turbo (2-6x slower otherwise)."""
+    if features.check_feature('libjpeg_turbo'):
+        logging.debug(f"Pillow JPEG codec: libjpeg-turbo {features.version_feature('libjpeg_turbo')}")
+    else:
+        logging.warning("Pillow is not linked against libjpeg-turbo; JPEG processing will be slower. "
+                        "See DOCS/README-install-reqs.md.")
+
 def convert_to_rgb(img):
     """Convert any image mode to RGB."""
     if img.mode == 'RGB':
@@ -79,12 +87,14 @@ def reduce_cover(cover_path):
             # Convert any image mode to RGB
             img = convert_to_rgb(img)
             
-            # Save with reduced quality to temp file
+            # Save with reduced quality to temp file, as baseline 4:2:0 JPEG
             img.save(
                 temp_path,
                 format='JPEG',
                 quality=REDUCE_QUALITY,
-                optimize=True
+                optimize=True,
+                subsampling='4:2:0',
+                progressive=False
             )
             
             # Verify the temp file
@@ -136,6 +146,7 @@ def main():
             sys.exit(1)
 
         logging.info(f"Starting Album Cover Compressor resolution reduction (quality {REDUCE_QUALITY})")
+        log_jpeg_backend()
         logging.info(f"Scanning: {music_path}")
 
         processed = 0
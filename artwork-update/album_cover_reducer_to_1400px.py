@@ -15,9 +15,20 @@ import sys
 import logging
 import argparse
 import configparser
-from PIL import Image, ImageFile
+from PIL import Image, ImageFile, features
 import shutil
 
+# PyTurboJPEG is optional: when present, oversized JPEGs are decoded at a
+# reduced DCT scale straight from libjpeg-turbo instead of at full size.
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB
+    try:
+        TURBOJPEG = TurboJPEG()
+    except (OSError, RuntimeError):  # Python binding present, libturbojpeg missing
+        TURBOJPEG = None
+except ImportError:
+    TURBOJPEG = None
+
 # Constants
 CONFIG_FILE = "artwork-config.ini"
 LOG_FILE = "cover_resizer.log"
@@ -56,6 +67,25 @@ def is_valid_image(filepath):
         logging.debug(f"Invalid image {filepath}: {str(e)}")
         return False
 
+def inspect_cover(filepath):
+    """Open a cover once, checking it's a readable image within MAX_PIXELS.
+
+    Only the header is parsed; pixels are decoded later, and only if a resize
+    is actually needed. Returns the open Image (the caller must close it), or
+    None if the file is invalid.
+    """
+    try:
+        img = Image.open(filepath)
+    except Exception as e:
+        logging.debug(f"Invalid image {filepath}: {str(e)}")
+        return None
+
+    if img.width * img.height > MAX_PIXELS:
+        logging.debug(f"Invalid image {filepath}: Image too large: {img.width}x{img.height}")
+        img.close()
+        return None
+    return img
+
 def convert_to_rgb(img):
     """Convert any image mode to RGB."""
     if img.mode == 'RGB':
@@ -68,6 +98,46 @@ def convert_to_rgb(img):
         return img.convert('RGB')
     return img.convert('RGB')
 
+def decode_for_resize(cover_path, target_size):
+    """Decode a JPEG at the smallest libjpeg-turbo scale still covering target_size.
+
+    libjpeg-turbo can scale by 1/2, 1/4, 1/8 (and others) inside the IDCT, so a
+    6000px cover headed for 1400px never gets decoded at full size. Returns a
+    PIL Image, or None if PyTurboJPEG is unavailable or can't decode the file,
+    in which case the caller falls back to a regular Pillow decode.
+    """
+    if TURBOJPEG is None:
+        return None
+
+    try:
+        with open(cover_path, 'rb') as f:
+            data = f.read()
+        header = TURBOJPEG.decode_header(data)
+        width, height = header[0], header[1]
+
+        # Pick the smallest scale whose output is still at least target_size,
+        # so the final LANCZOS pass only ever shrinks.
+        scale = (1, 1)
+        for num, denom in sorted(TURBOJPEG.scaling_factors, key=lambda f: f[0] / f[1]):
+            if (-(-width * num // denom) >= target_size[0] and
+                    -(-height * num // denom) >= target_size[1]):
+                scale = (num, denom)
+                break
+
+        pixels = TURBOJPEG.decode(data, pixel_format=TJPF_RGB, scaling_factor=scale)
+        return Image.fromarray(pixels)
+    except Exception as e:
+        logging.debug(f"TurboJPEG decode failed for {cover_path}, using Pillow: {str(e)}")
+        return None
+
+def log_jpeg_backend():
+    """Log Pillow's JPEG codec, warning if it isn't libjpeg-turbo (2-6x slower otherwise)."""
+    if features.check_feature('libjpeg_turbo'):
+        logging.debug(f"Pillow JPEG codec: libjpeg-turbo {features.version_feature('libjpeg_turbo')}")
+    else:
+        logging.warning("Pillow is not linked against libjpeg-turbo; JPEG processing will be slower. "
+                        "See DOCS/README-install-reqs.md.")
+
 def load_config():
     """Load configuration. Returns rootmusicdir, or None if unset."""
     config = configparser.ConfigParser()
@@ -87,22 +157,21 @@ def resize_cover(cover_path):
         logging.warning(f"Cannot read (permissions): {cover_path}")
         return False
 
-    if not is_valid_image(cover_path):
+    img = inspect_cover(cover_path)
+    if img is None:
         logging.warning(f"Invalid/corrupted/oversized image: {cover_path}")
         return False
 
     try:
-        with Image.open(cover_path) as img:
-            # Convert any image mode to RGB
-            img = convert_to_rgb(img)
-            
-            # Check if resizing is needed
+        with img:
+            # Check if resizing is needed (header only, nothing decoded yet)
             if img.width <= MAX_RESOLUTION and img.height <= MAX_RESOLUTION:
                 return False
             
             # Calculate new size maintaining aspect ratio
-            ratio = min(MAX_RESOLUTION/img.width, MAX_RESOLUTION/img.height)
-            new_size = (int(img.width * ratio), int(img.height * ratio))
+            width, height = img.size
+            ratio = min(MAX_RESOLUTION/width, MAX_RESOLUTION/height)
+            new_size = (int(width * ratio), int(height * ratio))
             
             # Create temp file path
             temp_dir = os.path.dirname(cover_path)
@@ -110,13 +179,27 @@ def resize_cover(cover_path):
             temp_path = os.path.join(temp_dir, temp_name)
             
             try:
-                # Save with maximum quality settings
-                img.resize(new_size, Image.LANCZOS).save(
+                # Prefer a DCT-scaled decode for JPEGs; fall back to decoding the
+                # already-open image, converting any image mode to RGB
+                source = decode_for_resize(cover_path, new_size) if img.format == 'JPEG' else None
+                if source is None:
+                    # For JPEGs, have libjpeg scale down by 1/2, 1/4 or 1/8 inside the
+                    # IDCT while decoding; draft never goes below new_size, and is a
+                    # no-op for other formats
+                    img.draft('RGB', new_size)
+                    source = convert_to_rgb(img)
+
+                # Save as baseline 4:2:0 JPEG: visually lossless at this quality,
+                # ~30% smaller than 4:4:4, and cheaper for players to decode.
+                # reducing_gap lets Pillow box-average by a whole factor first (in C)
+                # and only LANCZOS the last <3x, for sources draft couldn't shrink
+                source.resize(new_size, Image.LANCZOS, reducing_gap=3.0).save(
                     temp_path,
                     format='JPEG',
                     quality=RESIZE_QUALITY,
                     optimize=True,
-                    subsampling=0,
+                    subsampling='4:2:0',
+                    progressive=False,
                     dpi=(300, 300)
                 )
                 
@@ -133,7 +216,7 @@ def resize_cover(cover_path):
                 # Replace original
                 shutil.move(temp_path, cover_path)
                 
-                logging.info(f"Resized {cover_path} from {img.width}x{img.height} to {new_size[0]}x{new_size[1]}")
+                logging.info(f"Resized {cover_path} from {width}x{height} to {new_size[0]}x{new_size[1]}")
                 return True
                 
             except Exception as save_error:
@@ -166,6 +249,7 @@ def main():
             sys.exit(1)
 
         logging.info(f"Starting Album Cover Art Reducer resizing (max {MAX_RESOLUTION}px)")
+        log_jpeg_backend()
         logging.info(f"Scanning: {music_path}")
 
         processed = 0
@@ -10,6 +10,8 @@ import signal
 import logging
 import argparse
 import configparser
+import functools
+import shutil
 import requests
 from mutagen.id3 import ID3, error as ID3Error
 from PIL import Image
@@ -75,28 +77,28 @@ def is_cd_folder(name):
     """Check if folder is a CD subfolder"""
     return name.lower().startswith(CD_PREFIXES)
 
-def get_artist_album_from_mp3(folder):
-    """Extract metadata from first MP3 found"""
-    for file in os.listdir(folder):
+def get_artist_album_from_mp3(folder, mp3_files):
+    """Extract metadata from first tagged MP3 in mp3_files"""
+    for file in mp3_files:
         if should_exit:
             return None, None
-        if file.lower().endswith('.mp3'):
-            try:
-                audio = ID3(os.path.join(folder, file))
-                artist = audio.get('TPE1').text[0] if 'TPE1' in audio else None
-                album = audio.get('TALB').text[0] if 'TALB' in audio else None
-                if artist and album:
-                    return artist, album
-            except ID3Error:
-                continue
+        try:
+            audio = ID3(os.path.join(folder, file))
+            artist = audio.get('TPE1').text[0] if 'TPE1' in audio else None
+            album = audio.get('TALB').text[0] if 'TALB' in audio else None
+            if artist and album:
+                return artist, album
+        except ID3Error:
+            continue
     return None, None
 
-def has_mp3s(folder):
-    """Check if folder contains MP3 files"""
+def list_folder(folder):
+    """List folder entry names with one directory read (empty if unreadable)"""
     try:
-        return any(f.lower().endswith('.mp3') for f in os.listdir(folder))
+        with os.scandir(folder) as entries:
+            return [entry.name for entry in entries]
     except PermissionError:
-        return False
+        return []
 
 def get_image_resolution(image_path):
     """Get resolution of image file"""
@@ -106,8 +108,12 @@ def get_image_resolution(image_path):
     except Exception:
         return (0, 0)
 
+@functools.lru_cache(maxsize=None)
 def fetch_apple_music_artwork(artist, album):
-    """Get artwork URL and resolution from Apple Music"""
+    """Get artwork URL and resolution from Apple Music.
+
+    Cached per (artist, album) so multi-disc albums only look up once per run.
+    """
     if should_exit:
         return None, (0, 0)
     try:
@@ -130,12 +136,10 @@ def download_cover(artwork_url, save_path, expected_res=(1200,1200)):
         # Download the image
         response = requests.get(artwork_url, stream=True, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
-        
+        response.raw.decode_content = True
+
         with open(temp_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if should_exit:
-                    return False
-                f.write(chunk)
+            shutil.copyfileobj(response.raw, f, 1024 * 1024)
 
         # Verify file size
         file_size = os.path.getsize(temp_path)
@@ -181,10 +185,16 @@ def process_folder(folder, root_path=None):
     an album itself. Pass None (as -i mode does) to process folder
     unconditionally.
     """
-    if should_exit or (root_path is not None and Path(folder) == Path(root_path)) or not has_mp3s(folder):
+    if should_exit or (root_path is not None and Path(folder) == Path(root_path)):
+        return False
+
+    # One listing covers the MP3 lookup and the existing-cover check below
+    names = list_folder(folder)
+    mp3_files = [f for f in names if f.lower().endswith('.mp3')]
+    if not mp3_files:
         return False
 
-    artist, album = get_artist_album_from_mp3(folder)
+    artist, album = get_artist_album_from_mp3(folder, mp3_files)
     if not artist or not album:
         logging.info(f"⚠️  No metadata found in: {os.path.basename(folder)}")
         return False
@@ -196,7 +206,7 @@ def process_folder(folder, root_path=None):
         logging.info(f"❌ No artwork found for: {artist} - {album}")
         return False
     
-    existing_cover = os.path.exists(cover_path)
+    existing_cover = 'cover.jpg' in names
     existing_res = get_image_resolution(cover_path) if existing_cover else (0, 0)
     
     if download_cover(artwork_url, cover_path, artwork_res):
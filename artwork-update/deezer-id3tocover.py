@@ -32,6 +32,9 @@ import signal
 import logging
 import argparse
 import configparser
+import functools
+import shutil
+import struct
 import requests
 from PIL import Image, UnidentifiedImageError
 from mutagen.easyid3 import EasyID3
@@ -46,6 +49,7 @@ LOG_FILE = "cover_updater.log"
 DEEZER_API_URL = "https://api.deezer.com/search/album"
 CD_PREFIXES = ('cd', 'disc', 'disk')  # Common disc subfolder prefixes
 VALID_COVER_NAMES = ['cover.jpg']     # Recognized cover image filenames
+HEADER_PEEK_SIZE = 32 * 1024          # Bytes read before committing to a download
 
 # Global exit flag for safe shutdown
 should_exit = False
@@ -111,46 +115,73 @@ def is_cd_folder(name):
     """
     return name.lower().startswith(CD_PREFIXES)
 
-def get_artist_album_from_mp3(folder):
+def get_artist_album_from_mp3(folder, mp3_files):
     """
-    Extract artist and album metadata from the first MP3 found in the folder.
+    Extract artist and album metadata from the first tagged MP3 in the folder.
 
     Args:
         folder (str): Full path to album folder
+        mp3_files (list): MP3 file names in the folder
 
     Returns:
         tuple: (artist, album) or (None, None)
     """
-    for file in os.listdir(folder):
+    for file in mp3_files:
         if should_exit:
             return None, None
 
-        if file.lower().endswith('.mp3'):
-            try:
-                tags = EasyID3(os.path.join(folder, file))
-                artist = tags.get('artist', [''])[0].strip()
-                album = tags.get('album', [''])[0].strip()
-                if artist and album:
-                    return artist, album
-            except (ID3NoHeaderError, ID3Error):
-                continue
+        try:
+            tags = EasyID3(os.path.join(folder, file))
+            artist = tags.get('artist', [''])[0].strip()
+            album = tags.get('album', [''])[0].strip()
+            if artist and album:
+                return artist, album
+        except (ID3NoHeaderError, ID3Error):
+            continue
     return None, None
 
-def has_mp3s(folder):
+def list_folder(folder):
     """
-    Check if folder contains any MP3 files.
+    List a folder's entries with a single directory read.
 
     Args:
         folder (str): Path to folder
 
     Returns:
-        bool: True if MP3 files exist
+        list: Entry names (empty if the folder can't be read)
     """
     try:
-        return any(f.lower().endswith('.mp3') for f in os.listdir(folder))
+        with os.scandir(folder) as entries:
+            return [entry.name for entry in entries]
     except PermissionError:
         logging.warning(f"Permission denied accessing {folder}")
-        return False
+        return []
+
+def jpeg_size(data):
+    """
+    Read a JPEG's dimensions from its SOFn marker without decoding it.
+
+    Args:
+        data (bytes): Start of the JPEG file (the header segments are enough)
+
+    Returns:
+        tuple or None: (width, height), or None if not a JPEG or no SOF in data
+    """
+    if data[:2] != b"\xff\xd8":
+        return None
+    i = 2
+    while i + 9 <= len(data):
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        if marker == 0xFF:  # Fill byte before a marker
+            i += 1
+            continue
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack(">HH", data[i + 5:i + 9])
+            return width, height
+        i += 2 + struct.unpack(">H", data[i + 2:i + 4])[0]
+    return None
 
 def validate_image(image_data, min_res):
     """
@@ -172,20 +203,21 @@ def validate_image(image_data, min_res):
     except (UnidentifiedImageError, IOError, SyntaxError):
         return False
 
-def get_existing_cover(folder, min_res):
+def get_existing_cover(folder, names, min_res):
     """
     Check for an existing high-quality cover.jpg file.
 
     Args:
         folder (str): Folder to check
+        names (list): Entry names in the folder (from list_folder)
         min_res (int): Minimum resolution
 
     Returns:
         str or None: Path to valid cover if found
     """
     for name in VALID_COVER_NAMES:
-        path = os.path.join(folder, name)
-        if os.path.exists(path):
+        if name in names:
+            path = os.path.join(folder, name)
             try:
                 with Image.open(path) as img:
                     if (img.format in ('JPEG', 'JFIF') and 
@@ -196,23 +228,26 @@ def get_existing_cover(folder, min_res):
                 continue
     return None
 
-def has_any_cover(folder):
+def has_any_cover(names):
     """
     Check for the existence of any recognized cover file.
 
     Args:
-        folder (str): Folder to check
+        names (list): Entry names in the folder (from list_folder)
 
     Returns:
         bool: True if any cover image exists
     """
-    return any(os.path.exists(os.path.join(folder, name)) 
-               for name in VALID_COVER_NAMES)
+    return any(name in names for name in VALID_COVER_NAMES)
 
+@functools.lru_cache(maxsize=None)
 def fetch_deezer_artwork(artist, album):
     """
     Query Deezer API for high-res album artwork.
 
+    Results (including misses) are cached per (artist, album) for the rest of
+    the run, so the CD subfolders of a multi-disc album share one lookup.
+
     Args:
         artist (str): Artist name
         album (str): Album title
@@ -257,13 +292,21 @@ def safe_save_image(image_url, save_path, min_res):
         # Fetch image
         response = requests.get(image_url, stream=True, timeout=15)
         response.raise_for_status()
+        response.raw.decode_content = True
+
+        # Check the JPEG header before fetching the rest, so a non-JPEG or an
+        # undersized/non-square image is rejected without downloading it all
+        head = response.raw.read(HEADER_PEEK_SIZE)
+        if not head.startswith(b"\xff\xd8"):
+            raise ValueError("Image failed validation (not a JPEG)")
+        size = jpeg_size(head)
+        if size and (size[0] < min_res or size[1] < min_res or size[0] != size[1]):
+            raise ValueError(f"Image failed validation ({size[0]}x{size[1]})")
 
         # Write to temporary file
         with open(temp_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if should_exit:
-                    raise KeyboardInterrupt()
-                f.write(chunk)
+            f.write(head)
+            shutil.copyfileobj(response.raw, f, 1024 * 1024)
 
         # Validate the image
         with open(temp_path, 'rb') as f:
@@ -300,18 +343,26 @@ def process_folder(folder, root_path, min_res):
         return False
 
     try:
-        # Skip base folder or empty/non-music folders
-        if (root_path is not None and Path(folder) == Path(root_path)) or not has_mp3s(folder):
+        # Skip base folder
+        if root_path is not None and Path(folder) == Path(root_path):
+            return False
+
+        # One listing covers the MP3 lookup and the cover checks below
+        names = list_folder(folder)
+
+        # Skip empty/non-music folders
+        mp3_files = [f for f in names if f.lower().endswith('.mp3')]
+        if not mp3_files:
             return False
 
         # Read metadata
-        artist, album = get_artist_album_from_mp3(folder)
+        artist, album = get_artist_album_from_mp3(folder, mp3_files)
         if not artist or not album:
             logging.debug(f"No metadata in {os.path.basename(folder)}")
             return False
 
         # Skip if cover is already valid
-        existing_cover = get_existing_cover(folder, min_res)
+        existing_cover = get_existing_cover(folder, names, min_res)
         if existing_cover:
             logging.info(f"✓ {artist} - {album} (has good cover)")
             return False
@@ -324,7 +375,7 @@ def process_folder(folder, root_path, min_res):
 
         save_path = os.path.join(folder, 'cover.jpg')
         if safe_save_image(artwork_url, save_path, min_res):
-            action = "upgraded" if has_any_cover(folder) else "added"
+            action = "upgraded" if has_any_cover(names) else "added"
             logging.info(f"↑ {artist} - {album} ({action} cover)")
             return True
 
@@ -29,15 +29,27 @@ Usage:
 
   Process CD folders in the entire library:
     python3 export-coverart.py -a -c
+
+  Album folders are independent, so -a spreads them across a process pool
+  (one worker per CPU by default; -j 1 processes them one at a time).
+
+  -a runs remember each cleanly processed folder's MP3 modification times in
+  ~/.export_coverart_cache.json and skip folders whose MP3s haven't changed
+  since; --force processes every folder regardless.
 """
 
 import os
+import re
 import sys
+import mmap
+import struct
+import json
 import argparse
 import configparser
+from concurrent.futures import ProcessPoolExecutor
 from io import BytesIO
 from PIL import Image
-from mutagen.id3 import ID3, ID3NoHeaderError
+from mutagen.id3 import ID3, ID3NoHeaderError, APIC, PIC
 
 # Path to the configuration file
 CONFIG_PATH = "artwork-config.ini"
@@ -49,8 +61,47 @@ config.read(CONFIG_PATH)
 # Root music directory (read from the config file)
 ROOT_MUSIC_DIR = config.get('paths', 'rootmusicdir', fallback='/media/william/NewData/Music/MP3B/')
 
+# Only the artwork frames get decoded when comparing covers; every other frame
+# (lyrics, comments, text) is kept as raw bytes. PIC is the ID3v2.2 equivalent,
+# translated to APIC on load.
+ARTWORK_FRAMES = {"APIC": APIC, "PIC": PIC}
+
+# Per-folder MP3 state from the last clean -a run (see load_cache)
+CACHE_FILE = os.path.join(os.path.expanduser("~"), ".export_coverart_cache.json")
+
+# ID3v2.3/v2.4 frame IDs are four uppercase letters or digits
+VALID_FRAME_ID = re.compile(rb"[A-Z0-9]{4}").fullmatch
+
+# Most freed space kept as ID3 padding when stripping artwork (see keep_tag_size)
+MAX_KEPT_PADDING = 128 * 1024
+
+def jpeg_size(data):
+    """Return (width, height) from a JPEG's SOFn marker, or None if not found in data.
+
+    Walks the marker segments after SOI, so only the header bytes are needed.
+    """
+    if data[:2] != b"\xff\xd8":
+        return None
+    i = 2
+    while i + 9 <= len(data):
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        if marker == 0xFF:  # Fill byte before a marker
+            i += 1
+            continue
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack(">HH", data[i + 5:i + 9])
+            return width, height
+        i += 2 + struct.unpack(">H", data[i + 2:i + 4])[0]
+    return None
+
 def get_resolution_from_bytes(image_data):
     """Get width * height resolution of an image from raw byte data."""
+    size = jpeg_size(image_data)
+    if size:
+        return size[0] * size[1]
+    # Not a JPEG (or an unusual one): let Pillow identify it
     try:
         image = Image.open(BytesIO(image_data))
         return image.width * image.height
@@ -58,58 +109,168 @@ def get_resolution_from_bytes(image_data):
         return 0
 
 def read_cover_jpg_resolution(folder_path):
-    """Return resolution (width * height) of cover.jpg, if present."""
+    """Return resolution (width * height) of cover.jpg, or 0 if missing or unreadable."""
     cover_path = os.path.join(folder_path, "cover.jpg")
-    if os.path.exists(cover_path):
-        try:
-            with Image.open(cover_path) as img:
-                return img.width * img.height
-        except Exception:
-            return 0
-    return 0
-
-def export_and_compare_cover(folder_path):
-    """Export and compare embedded cover art to cover.jpg, keep highest res version."""
-    mp3_files = [f for f in os.listdir(folder_path) if f.lower().endswith(".mp3")]
+    try:
+        # The SOF marker is almost always within the first 64 KB
+        with open(cover_path, "rb") as f:
+            size = jpeg_size(f.read(65536))
+        if size:
+            return size[0] * size[1]
+        with Image.open(cover_path) as img:
+            return img.width * img.height
+    except Exception:
+        return 0
+
+def fast_extract_apic(mp3_path):
+    """Return the image data of every APIC frame in an MP3's ID3v2.3/v2.4 tag.
+
+    Walks the frame headers directly over an mmap of the file instead of having
+    mutagen build frame objects. The walk must end exactly at the end of the
+    tag or at all-zero padding, so an empty list reliably means "no artwork".
+    A file with no ID3v2 tag at all also gets an empty list: there's nowhere
+    for artwork to be, and mutagen would only raise ID3NoHeaderError.
+    Returns None for anything it doesn't handle (ID3v2.2,
+    unsynchronisation, compressed/encrypted frames, invalid frame IDs, sizes
+    that don't walk cleanly) so the caller can fall back to mutagen.
+    """
+    try:
+        with open(mp3_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if data[:3] != b"ID3":
+                return []
+            if data[3] not in (3, 4) or data[5] & 0x80:
+                return None
+            version = data[3]
+            end = 10 + ((data[6] & 0x7f) << 21 | (data[7] & 0x7f) << 14 | (data[8] & 0x7f) << 7 | (data[9] & 0x7f))
+            if end > len(data):
+                return None
+
+            offset = 10
+            if data[5] & 0x40:  # Extended header: v2.4 size includes itself, v2.3 doesn't
+                ext_size = struct.unpack(">I", data[10:14])[0]
+                if version == 4:
+                    offset += (ext_size & 0x7f) | (ext_size >> 8 & 0x7f) << 7 | (ext_size >> 16 & 0x7f) << 14 | (ext_size >> 24 & 0x7f) << 21
+                else:
+                    offset += 4 + ext_size
+
+            images = []
+            while offset < end:
+                if data[offset] == 0:
+                    # Reached padding. It must be zeros all the way to the end of the
+                    # tag; anything else means a frame size was misread (e.g. v2.4
+                    # tags written with non-synchsafe sizes by old iTunes/WMP)
+                    if data[offset:end].count(0) != end - offset:
+                        return None
+                    break
+                frame_id = data[offset:offset + 4]
+                if offset + 10 > end or not VALID_FRAME_ID(frame_id):
+                    return None
+                size = struct.unpack(">I", data[offset + 4:offset + 8])[0]
+                if version == 4:
+                    size = (size & 0x7f) | (size >> 8 & 0x7f) << 7 | (size >> 16 & 0x7f) << 14 | (size >> 24 & 0x7f) << 21
+                start = offset + 10
+                offset = start + size
+                if offset > end:
+                    return None
+                if frame_id != b"APIC":
+                    continue
+
+                # Compression/encryption/grouping (and v2.4 unsync/data length) need mutagen
+                if data[start - 1] & (0x4f if version == 4 else 0xe0):
+                    return None
+
+                # Layout: encoding, MIME type\0, picture type, description\0, image data
+                mime_end = data.find(b"\x00", start + 1, offset)
+                if mime_end < 0:
+                    return None
+                desc_start = mime_end + 2
+                if data[start] in (1, 2):  # UTF-16: two-byte, aligned terminator
+                    desc_end = desc_start
+                    while desc_end + 1 < offset and data[desc_end:desc_end + 2] != b"\x00\x00":
+                        desc_end += 2
+                    image_start = desc_end + 2
+                else:
+                    desc_end = data.find(b"\x00", desc_start, offset)
+                    image_start = desc_end + 1
+                if desc_end < 0 or image_start > offset:
+                    return None
+                images.append(data[image_start:offset])
+            return images
+    except (OSError, ValueError, struct.error):
+        return None
+
+def scan_folder_entries(entries):
+    """Split a folder's scandir entries into (mp3_files, has_cover)."""
+    names = [entry.name for entry in entries if entry.is_file()]
+    return [f for f in names if f.lower().endswith(".mp3")], "cover.jpg" in names
+
+def export_and_compare_cover(folder_path, mp3_files, has_cover):
+    """Export and compare embedded cover art to cover.jpg, keep highest res version.
+
+    Returns True if the folder had MP3s and was processed without any errors.
+    """
     if not mp3_files:
         print(f"No MP3 files found in {folder_path}. Skipping...")
         return False
 
     # Read resolution of existing cover.jpg
-    existing_res = read_cover_jpg_resolution(folder_path)
-    best_apic = None
+    existing_res = read_cover_jpg_resolution(folder_path) if has_cover else 0
+    best_data = None
     best_res = 0
+    no_artwork_files = set()
+    clean = True
 
     # Find highest resolution APIC in the folder
     for mp3_file in mp3_files:
         mp3_path = os.path.join(folder_path, mp3_file)
         try:
-            tags = ID3(mp3_path)
-            for tag in tags.getall("APIC"):
-                res = get_resolution_from_bytes(tag.data)
+            images = fast_extract_apic(mp3_path)
+            if images == []:
+                # A clean walk of the whole tag found no APIC, so the removal pass
+                # can skip this file. An empty answer from the restricted mutagen
+                # parse below isn't proof enough; those still get the full check.
+                no_artwork_files.add(mp3_file)
+            elif images is None:
+                tags = ID3(mp3_path, known_frames=ARTWORK_FRAMES, load_v1=False)
+                images = [tag.data for tag in tags.getall("APIC")]
+            for image_data in images:
+                res = get_resolution_from_bytes(image_data)
                 if res > best_res:
                     best_res = res
-                    best_apic = tag
+                    best_data = image_data
         except Exception as e:
             print(f"Error reading artwork from {mp3_path}: {e}")
+            clean = False
 
-    if best_apic and best_res > existing_res:
+    if best_data and best_res > existing_res:
         # Save higher-resolution embedded art as cover.jpg
         try:
             with open(os.path.join(folder_path, "cover.jpg"), "wb") as f:
-                f.write(best_apic.data)
+                f.write(best_data)
             print(f"Updated cover.jpg in {folder_path} with higher-resolution embedded art")
         except Exception as e:
             print(f"Failed to write new cover.jpg in {folder_path}: {e}")
+            clean = False
     else:
         print(f"Existing cover.jpg in {folder_path} is higher or equal resolution. No update needed.")
 
     # Remove all embedded artwork after comparison
-    remove_embedded_artwork_from_all(folder_path, mp3_files)
-    return True
+    removed = remove_embedded_artwork_from_all(folder_path, mp3_files, no_artwork_files)
+    return clean and removed
+
+def keep_tag_size(info):
+    """mutagen padding callback: keep up to MAX_KEPT_PADDING of freed space as padding.
+
+    When the artwork removed was small enough, the tag keeps its old size and is
+    overwritten in place instead of mutagen rewriting the whole MP3 to shift the
+    audio back. Larger artwork is still reclaimed, so the file shrinks.
+    """
+    if info.padding < 0:
+        return info.get_default_padding()
+    return min(info.padding, MAX_KEPT_PADDING)
 
 def remove_embedded_artwork(mp3_path):
-    """Remove all embedded artwork (APIC frames) from a single MP3 file."""
+    """Remove all embedded artwork (APIC frames) from a single MP3 file. Returns False on error."""
     try:
         try:
             audio = ID3(mp3_path)
@@ -119,31 +280,170 @@ def remove_embedded_artwork(mp3_path):
         apic_count = len(audio.getall("APIC"))
         if apic_count > 0:
             audio.delall("APIC")
-            audio.save(mp3_path, v2_version=3)
+            audio.save(mp3_path, v2_version=3, padding=keep_tag_size)
             print(f"Removed {apic_count} embedded artwork(s) from {mp3_path}")
         else:
             print(f"No embedded artwork found in {mp3_path}")
+        return True
     except Exception as e:
         print(f"Error removing artwork from {mp3_path}: {e}")
+        return False
+
+def remove_embedded_artwork_from_all(folder_path, mp3_files, no_artwork_files=None):
+    """Remove artwork from all MP3 files in the folder.
 
-def remove_embedded_artwork_from_all(folder_path, mp3_files):
-    """Remove artwork from all MP3 files in the folder."""
+    no_artwork_files, if given, is the set of files fast_extract_apic fully
+    walked and found no artwork in; they're reported as having none without a
+    second full tag parse. Every other file gets the full mutagen check.
+    Returns True if every file was handled without error.
+    """
+    ok = True
     for mp3_file in mp3_files:
         full_path = os.path.join(folder_path, mp3_file)
-        remove_embedded_artwork(full_path)
-
-def process_folder(folder_path):
-    """Process a folder: compare embedded and external cover art, keep highest resolution, and remove embedded art."""
+        if no_artwork_files and mp3_file in no_artwork_files:
+            print(f"No embedded artwork found in {full_path}")
+            continue
+        if not remove_embedded_artwork(full_path):
+            ok = False
+    return ok
+
+def process_folder(folder_path, mp3_files=None, has_cover=None):
+    """Process a folder: compare embedded and external cover art, keep highest resolution, and remove embedded art.
+
+    mp3_files/has_cover come from walk_albums when walking the library; for a
+    single folder (-i) they're left as None and the folder is scanned here.
+    Returns True if the folder was processed without errors.
+    """
     print(f"\nProcessing folder: {folder_path}")
-    export_and_compare_cover(folder_path)
+    if mp3_files is None:
+        with os.scandir(folder_path) as entries:
+            mp3_files, has_cover = scan_folder_entries(entries)
+    return export_and_compare_cover(folder_path, mp3_files, has_cover)
 
-def process_cd_folders():
-    """Process folders named like 'CD 1', 'CD 2', etc."""
-    for root, dirs, _ in os.walk(ROOT_MUSIC_DIR):
-        for dir_name in dirs:
-            if dir_name.lower().startswith("cd "):
-                folder_path = os.path.join(root, dir_name)
-                process_folder(folder_path)
+def load_cache():
+    """Load the {folder_path: {mp3 name: [mtime_ns, ctime_ns, size]}} cache, or {} if missing/unreadable."""
+    try:
+        with open(CACHE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(cache):
+    """Write the cache atomically, so an interrupted write can't corrupt it."""
+    temp_path = f"{CACHE_FILE}.tmp"
+    try:
+        with open(temp_path, "w") as f:
+            json.dump(cache, f)
+        os.replace(temp_path, CACHE_FILE)
+    except OSError as e:
+        print(f"Failed to write cache {CACHE_FILE}: {e}")
+
+def mp3_state(folder_path, mp3_files):
+    """Return {mp3 name: [mtime_ns, ctime_ns, size]} for a folder's MP3s, or None if any can't be stat'd.
+
+    Tag editors (e.g. Picard's "preserve timestamps" option) can re-embed artwork
+    while restoring the modification time, and the artwork can fit in the padding
+    left by keep_tag_size so the size doesn't change either. The inode change time
+    can't be set back, so any write to the file still shows up. Lists rather than
+    tuples, so the state compares equal to what json.load gives back.
+    """
+    state = {}
+    try:
+        for name in mp3_files:
+            st = os.stat(os.path.join(folder_path, name))
+            state[name] = [st.st_mtime_ns, st.st_ctime_ns, st.st_size]
+    except OSError:
+        return None
+    return state
+
+def process_album(album):
+    """Process one (folder_path, mp3_files, has_cover, cached_state) tuple.
+
+    Skips the folder if its MP3s match cached_state, the state left by the last
+    clean run: with no embedded artwork left there's nothing to compare or
+    strip. Returns (folder_path, state to cache, or None if it shouldn't be).
+    """
+    folder_path, mp3_files, has_cover, cached_state = album
+    if cached_state is not None and mp3_files and mp3_state(folder_path, mp3_files) == cached_state:
+        print(f"\nSkipping unchanged folder: {folder_path}")
+        return folder_path, cached_state
+
+    if process_folder(folder_path, mp3_files, has_cover):
+        return folder_path, mp3_state(folder_path, mp3_files)
+    return folder_path, None
+
+def walk_albums(root_music_dir, cd_only=False):
+    """Yield (folder_path, mp3_files, has_cover) for every folder under root_music_dir.
+
+    With cd_only, only folders named like 'CD 1' are yielded. Each folder is
+    read with one os.scandir, which supplies both its own MP3s/cover.jpg and
+    the subfolders to descend into, so process_folder doesn't list it again.
+    Like os.walk, symlinked folders are processed but not descended into, and
+    unreadable folders are skipped.
+    """
+    # (path, descend into subfolders, yield this folder)
+    pending = [(root_music_dir, True, False)]
+    while pending:
+        folder_path, descend, selected = pending.pop()
+        try:
+            with os.scandir(folder_path) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        if selected:
+            yield (folder_path, *scan_folder_entries(entries))
+
+        if descend:
+            for entry in entries:
+                if entry.is_dir():
+                    child_selected = not cd_only or entry.name.lower().startswith("cd ")
+                    child_descend = not entry.is_symlink()
+                    if child_selected or child_descend:
+                        pending.append((entry.path, child_descend, child_selected))
+
+def process_folders(albums, jobs=None, cache=None, force=False):
+    """Process walk_albums output across a pool of worker processes (jobs=None uses one per CPU).
+
+    cache, if given, is load_cache()'s dict, keyed by absolute folder path:
+    unchanged folders are skipped (unless force) and it's updated in place with
+    each folder's new state.
+    """
+    def record(results):
+        for folder_path, state in results:
+            if cache is None:
+                continue
+            if state is None:
+                cache.pop(folder_path, None)
+            else:
+                cache[folder_path] = state
+
+    use_cache = cache is not None and not force
+    def make_tasks():
+        for folder_path, mp3_files, has_cover in albums:
+            # Absolute paths, so -p ./Music and -p /media/.../Music share entries
+            folder_path = os.path.abspath(folder_path)
+            yield folder_path, mp3_files, has_cover, cache.get(folder_path) if use_cache else None
+
+    tasks = make_tasks()
+
+    if jobs == 1:
+        record(map(process_album, tasks))
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        # Consuming the results also raises any worker exceptions here
+        record(executor.map(process_album, tasks, chunksize=4))
+
+def positive_int(value):
+    """argparse type for -j/--jobs: an integer of at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
 
 def main():
     """Parse command-line arguments and run cover processing."""
@@ -159,6 +459,12 @@ def main():
 
   Process CD folders only:
     python3 export-coverart.py -a -c
+
+  Process the entire library one folder at a time:
+    python3 export-coverart.py -a -j 1
+
+  Reprocess every folder, including ones unchanged since the last run:
+    python3 export-coverart.py -a --force
 """
     )
 
@@ -166,6 +472,8 @@ def main():
     parser.add_argument("-c", "--cd", action="store_true", help="Process CD folders only.")
     parser.add_argument("-i", "--input", type=str, help="Process a specific folder (album or CD folder).")
     parser.add_argument("-p", "--path", type=str, help="Override rootmusicdir from artwork-config.ini when used with -a.")
+    parser.add_argument("-j", "--jobs", type=positive_int, help="Number of folders to process in parallel with -a (default: one per CPU).")
+    parser.add_argument("-f", "--force", action="store_true", help="With -a, also process folders unchanged since the last run.")
 
     args = parser.parse_args()
 
@@ -180,14 +488,12 @@ def main():
         process_folder(args.input)
     elif args.all:
         root_music_dir = args.path or ROOT_MUSIC_DIR
-        for root, dirs, _ in os.walk(root_music_dir):
-            for dir_name in dirs:
-                folder_path = os.path.join(root, dir_name)
-                if args.cd:
-                    if dir_name.lower().startswith("cd "):
-                        process_folder(folder_path)
-                else:
-                    process_folder(folder_path)
+        cache = load_cache()
+        try:
+            process_folders(walk_albums(root_music_dir, cd_only=args.cd), args.jobs, cache, args.force)
+        finally:
+            # Keep progress from a partial run, e.g. after Ctrl+C
+            save_cache(cache)
 
 if __name__ == "__main__":
     main()
@@ -27,6 +27,8 @@ import signal
 import logging
 import argparse
 import configparser
+import functools
+import shutil
 import requests
 from mutagen.id3 import ID3, error as ID3Error
 from pathlib import Path
@@ -89,21 +91,22 @@ def load_config():
         logging.error(f"Config error: {str(e)}")
         raise
 
-def has_mp3s(folder):
+def list_folder(folder):
     """
-    Check if folder contains any MP3 files.
+    List a folder's entries with a single directory read.
 
     Args:
         folder (str): Path to folder
 
     Returns:
-        bool: True if MP3 files exist
+        list: Entry names (empty if the folder can't be read)
     """
     try:
-        return any(f.lower().endswith('.mp3') for f in os.listdir(folder))
+        with os.scandir(folder) as entries:
+            return [entry.name for entry in entries]
     except PermissionError:
         logging.warning(f"Permission denied accessing {folder}")
-        return False
+        return []
 
 def get_artist_album_from_id3(mp3_path):
     """
@@ -121,23 +124,14 @@ def get_artist_album_from_id3(mp3_path):
         logging.error(f"Error reading ID3 tags for {mp3_path}: {e}")
         return None, None
 
-def has_any_cover(folder):
-    """
-    Check for the existence of any recognized cover file.
-
-    Args:
-        folder (str): Folder to check
-
-    Returns:
-        bool: True if any cover image exists
-    """
-    return any(os.path.exists(os.path.join(folder, name)) 
-               for name in VALID_COVER_NAMES)
-
+@functools.lru_cache(maxsize=None)
 def fetch_lastfm_artwork(artist, album, api_key):
     """
     Query Last.fm API for album artwork.
 
+    Results (including misses) are cached per (artist, album) for the rest of
+    the run, so the CD subfolders of a multi-disc album share one lookup.
+
     Args:
         artist (str): Artist name
         album (str): Album title
@@ -177,12 +171,10 @@ def safe_save_image(image_url, save_path):
     try:
         response = requests.get(image_url, stream=True, timeout=15)
         response.raise_for_status()
+        response.raw.decode_content = True
 
         with open(temp_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if should_exit:
-                    raise KeyboardInterrupt()
-                f.write(chunk)
+            shutil.copyfileobj(response.raw, f, 1024 * 1024)
 
         if os.path.exists(save_path):
             os.remove(save_path)
@@ -213,12 +205,15 @@ def process_folder(folder, root_path, api_key):
         return False
 
     try:
-        # Skip base folder or empty/non-music folders
-        if (root_path is not None and Path(folder) == Path(root_path)) or not has_mp3s(folder):
+        # Skip base folder
+        if root_path is not None and Path(folder) == Path(root_path):
             return False
 
-        # Find first MP3 to get metadata
-        mp3_files = [f for f in os.listdir(folder) if f.lower().endswith('.mp3')]
+        # One listing covers the MP3 lookup and the existing-cover check below
+        names = list_folder(folder)
+
+        # Find first MP3 to get metadata; skip empty/non-music folders
+        mp3_files = [f for f in names if f.lower().endswith('.mp3')]
         if not mp3_files:
             return False
 
@@ -229,7 +224,7 @@ def process_folder(folder, root_path, api_key):
             return False
 
         # Skip if cover already exists
-        if has_any_cover(folder):
+        if any(name in VALID_COVER_NAMES for name in names):
             logging.info(f"✓ {artist} - {album} (has cover)")
             return False
 
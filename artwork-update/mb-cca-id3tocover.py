@@ -11,19 +11,19 @@ import configparser
 import requests
 import argparse
 import shutil
+import functools
 from mutagen.id3 import ID3, error as ID3Error
 from PIL import Image, ImageFile
 import musicbrainzngs
 import warnings
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from urllib.error import HTTPError
 
 # Configure musicbrainzngs to suppress specific warnings
 warnings.filterwarnings("ignore", category=UserWarning, module="musicbrainzngs")
 
-# Load configuration
-config = configparser.ConfigParser()
-config.read('artwork-config.ini')
+CONFIG_FILE = "artwork-config.ini"
 
 # Validate configuration
 def validate_config(config):
@@ -39,8 +39,6 @@ def validate_config(config):
                 print(f"Error: Missing '{field}' in section '{section}' in config file.")
                 sys.exit(1)
 
-validate_config(config)
-
 # Custom logging filter
 class MusicBrainzWarningFilter(logging.Filter):
     def filter(self, record):
@@ -67,8 +65,11 @@ console_handler.setFormatter(console_formatter)
 logger.addHandler(file_handler)
 logger.addHandler(console_handler)
 
-# Settings
-MIN_RES = int(config["settings"]["MIN_RES"])
+# Albums fetched concurrently with -a. Lookups are network-bound, so overlapping
+# them hides round-trip latency; musicbrainzngs still serialises its own API
+# calls to MusicBrainz's 1 request/second limit, this mostly overlaps the
+# Cover Art Archive downloads.
+DEFAULT_JOBS = 8
 
 # Setup MusicBrainz
 musicbrainzngs.set_useragent("ID3ToCover", "1.0", "https://example.com")
@@ -77,6 +78,10 @@ musicbrainzngs.set_useragent("ID3ToCover", "1.0", "https://example.com")
 ImageFile.LOAD_TRUNCATED_IMAGES = True
 Image.MAX_IMAGE_PIXELS = None  # Remove limit on image size
 
+# Cached per (artist, album): the CD subfolders of a multi-disc album share the
+# same tags, so every disc after the first skips the network lookup entirely.
+# Misses (None) are cached too, for the rest of this run.
+@functools.lru_cache(maxsize=None)
 def fetch_mb_cca_artwork(artist, album):
     try:
         results = musicbrainzngs.search_releases(artist=artist, release=album, limit=1)
@@ -89,21 +94,16 @@ def fetch_mb_cca_artwork(artist, album):
                     for image in art['images']:
                         if image.get("front", False) and image.get("image"):
                             return image["image"]
-                logger.info(f"✗ {artist} - {album} (no artwork found)")
                 return None
             except HTTPError as e:
                 if e.code == 404:
-                    logger.info(f"✗ {artist} - {album} (no artwork found)")
                     return None
                 raise
             except Exception:
-                logger.info(f"✗ {artist} - {album} (no artwork found)")
                 return None
-        logger.info(f"✗ {artist} - {album} (no artwork found)")
         return None
     except Exception:
         # Catch any other MusicBrainz API errors
-        logger.info(f"✗ {artist} - {album} (no artwork found)")
         return None
 
 def download_artwork(url, save_path):
@@ -112,13 +112,13 @@ def download_artwork(url, save_path):
         response.raise_for_status()
         if 'image' not in response.headers.get('Content-Type', ''):
             return False
-        
+        response.raw.decode_content = True
+
         # Create a temporary file in the same directory as the destination
         temp_dir = os.path.dirname(save_path)
         with tempfile.NamedTemporaryFile(dir=temp_dir, delete=False, suffix='.jpg') as tmp_file:
-            for chunk in response.iter_content(chunk_size=8192):
-                tmp_file.write(chunk)
             tmp_path = tmp_file.name
+            shutil.copyfileobj(response.raw, tmp_file, 1024 * 1024)
         
         # Verify the image can be opened before using it
         try:
@@ -157,10 +157,28 @@ def meets_resolution(image_path, min_res):
         logger.warning(f"Error checking image resolution: {e}")
         return False
 
-def process_folder(folder_path):
+def load_config():
+    """Load and validate the config file, returning {'music_path', 'min_res'}.
+
+    Settings are passed explicitly from main() down to process_folder rather
+    than read from module globals.
+    """
+    config = configparser.ConfigParser()
+    config.read(CONFIG_FILE)
+    validate_config(config)
+    return {
+        'music_path': config.get("paths", "rootmusicdir", fallback=None),
+        'min_res': int(config["settings"]["MIN_RES"]),
+    }
+
+def process_folder(folder_path, min_res):
     try:
         cover_path = os.path.join(folder_path, "cover.jpg")
-        mp3_files = [f for f in os.listdir(folder_path) if f.endswith(".mp3")]
+        # One directory read answers both "which MP3s?" and "is there a cover?"
+        with os.scandir(folder_path) as entries:
+            names = [entry.name for entry in entries]
+        mp3_files = [f for f in names if f.endswith(".mp3")]
+        has_cover = "cover.jpg" in names
         if not mp3_files:
             logger.warning(f"No MP3 files found in {folder_path}")
             return
@@ -169,18 +187,20 @@ def process_folder(folder_path):
         artist, album = get_artist_album_from_id3(first_mp3)
 
         artwork_url = fetch_mb_cca_artwork(artist, album)
+        if not artwork_url:
+            logger.info(f"✗ {artist} - {album} (no artwork found)")
 
         if artwork_url:
             temp_artwork_path = os.path.join(folder_path, "temp_cover.jpg")
             if download_artwork(artwork_url, temp_artwork_path):
                 try:
-                    if not os.path.exists(cover_path):
+                    if not has_cover:
                         shutil.move(temp_artwork_path, cover_path)
                         logger.info(f"↑ {artist} - {album} (added cover)")
                     else:
                         try:
                             with Image.open(cover_path) as existing_image, Image.open(temp_artwork_path) as downloaded_image:
-                                if downloaded_image.size > existing_image.size or not meets_resolution(cover_path, MIN_RES):
+                                if downloaded_image.size > existing_image.size or not meets_resolution(cover_path, min_res):
                                     shutil.move(temp_artwork_path, cover_path)
                                     logger.info(f"↑ {artist} - {album} (replaced cover)")
                                 else:
@@ -199,25 +219,58 @@ def process_folder(folder_path):
     except Exception as e:
         logger.error(f"Unexpected error processing folder {folder_path}: {e}")
 
-def process_all_folders(base_folder):
+def list_subdirs(path):
+    """Return (name, path) for each subdirectory of path.
+
+    os.scandir reports entry types from the directory listing itself (d_type on
+    Linux), so this costs one directory read instead of a stat per entry.
+    """
+    with os.scandir(path) as entries:
+        return [(entry.name, entry.path) for entry in entries if entry.is_dir()]
+
+def collect_album_folders(base_folder):
+    """List each album under base_folder as a list of its folders to process.
+
+    Multi-disc albums yield their 'CD N' subfolders together, so one worker
+    handles the whole album in turn and the later discs reuse the first disc's
+    cached MusicBrainz lookup instead of racing it with duplicate requests.
+    """
+    albums = []
+    for _, artist_path in list_subdirs(base_folder):
+        for _, album_path in list_subdirs(artist_path):
+            cd_subfolders = [path for name, path in list_subdirs(album_path) if name.lower().startswith('cd ')]
+            albums.append(cd_subfolders or [album_path])
+    return albums
+
+def process_album(folder_paths, min_res):
+    """Process one album's folders (its 'CD N' subfolders, or just the album) in order."""
+    for folder_path in folder_paths:
+        process_folder(folder_path, min_res)
+
+def process_all_folders(base_folder, min_res, jobs=DEFAULT_JOBS):
     try:
-        for artist_folder in os.listdir(base_folder):
-            artist_path = os.path.join(base_folder, artist_folder)
-            if os.path.isdir(artist_path):
-                for album_folder in os.listdir(artist_path):
-                    album_path = os.path.join(artist_path, album_folder)
-                    if os.path.isdir(album_path):
-                        cd_subfolders = [f for f in os.listdir(album_path) if os.path.isdir(os.path.join(album_path, f)) and f.lower().startswith('cd ')]
-                        if cd_subfolders:
-                            for cd_folder in cd_subfolders:
-                                cd_path = os.path.join(album_path, cd_folder)
-                                process_folder(cd_path)
-                        else:
-                            process_folder(album_path)
+        albums = collect_album_folders(base_folder)
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            try:
+                list(executor.map(functools.partial(process_album, min_res=min_res), albums))
+            except KeyboardInterrupt:
+                # Drop queued albums; only the ones already in flight finish
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
     except KeyboardInterrupt:
         logger.info("🛑 Script interrupted by user")
         sys.exit(0)
 
+def positive_int(value):
+    """argparse type for -j/--jobs: an integer of at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
 def main():
     parser = argparse.ArgumentParser(
         description="Fetch album artwork from MusicBrainz Cover Art Archive and save it as cover.jpg."
@@ -225,9 +278,11 @@ def main():
     parser.add_argument("-i", "--input", type=str, help="Process a specific folder (album folder).")
     parser.add_argument("-a", "--all", action="store_true", help="Process the entire music library.")
     parser.add_argument("-p", "--path", type=str, help="Override rootmusicdir from artwork-config.ini for this run.")
+    parser.add_argument("-j", "--jobs", type=positive_int, default=DEFAULT_JOBS, help=f"Number of albums to fetch concurrently with -a (default: {DEFAULT_JOBS}).")
     args = parser.parse_args()
 
-    root_music_dir = args.path or config.get("paths", "rootmusicdir", fallback=None)
+    config = load_config()
+    root_music_dir = args.path or config['music_path']
     if args.all and not root_music_dir:
         logger.error("💥 Error: no music directory set. Use -p <folder> or set [paths] rootmusicdir in artwork-config.ini.")
         sys.exit(1)
@@ -239,10 +294,10 @@ def main():
             if not os.path.isdir(args.input):
                 logger.error(f"💥 Error: {args.input} is not a valid directory.")
                 sys.exit(1)
-            process_folder(args.input)
+            process_folder(args.input, config['min_res'])
         elif args.all:
             logger.info(f"📁 Scanning: {root_music_dir}")
-            process_all_folders(root_music_dir)
+            process_all_folders(root_music_dir, config['min_res'], args.jobs)
         else:
             logger.error("💥 Error: Please specify either -i <folder> or -a to process all folders.")
             sys.exit(1)